@@ -23,6 +23,8 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = Field(default="password", description="Database password")
     DB_POOL_SIZE: int = Field(default=20, description="Database connection pool size")
     DB_MAX_OVERFLOW: int = Field(default=30, description="Database max overflow connections")
+    DB_POOL_TIMEOUT: int = Field(default=30, description="Seconds to wait for a pooled connection")
+    DB_POOL_RECYCLE: int = Field(default=1800, description="Recycle pooled connections after this many seconds")
     
     # Security
     SECRET_KEY: str = Field(
@@ -1,7 +1,9 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy import event, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.pool import NullPool
 from app.config import settings
 from app.logging_config import get_logger
@@ -12,15 +14,16 @@ import time
 logger = get_logger(__name__)
 
 # Production-grade engine configuration with proper connection pooling
-# For asyncpg, we use QueuePool which is the recommended approach
+# For asyncpg, we use the asyncio-adapted QueuePool (plain QueuePool is rejected by async engines)
 engine = create_async_engine(
     settings.DATABASE_URL,
     # Connection pool settings for production
-    poolclass=QueuePool,  # Use QueuePool for better connection management
+    poolclass=AsyncAdaptedQueuePool,  # Use a queue pool for better connection management
     pool_size=settings.DB_POOL_SIZE,  # Number of connections to maintain
     max_overflow=settings.DB_MAX_OVERFLOW,  # Additional connections beyond pool_size
+    pool_timeout=settings.DB_POOL_TIMEOUT,  # Fail fast instead of hanging when the pool is exhausted
     pool_pre_ping=True,  # Verify connections before using them
-    pool_recycle=3600,  # Recycle connections after 1 hour
+    pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle connections after 30 minutes by default
     # Performance settings
     echo=settings.DEBUG,  # SQL logging only in debug mode
     future=True,
@@ -98,6 +101,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     finally:
         await session.close()
 
+def dialect_insert(db: AsyncSession, table):
+    """
+    INSERT construct for the session's backend, so on_conflict_do_nothing works on
+    PostgreSQL and on the in-memory SQLite test database alike
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(table)
+    return pg_insert(table)
+
 async def init_database():
     """Initialize database with proper error handling"""
     try:
@@ -22,7 +22,7 @@ from app.exceptions import (
     ValidationError,
     DatabaseError
 )
-from app.database import get_db, init_database, close_database, db_health
+from app.database import get_db, init_database, close_database, db_health, dialect_insert
 from app.models import Book, Review, Author, Genre
 from app.crud import *
 from app.llama3_minimal import generate_summary, generate_summary_llama3
@@ -145,14 +145,18 @@ async def create_author(author: AuthorCreate, db: AsyncSession = Depends(get_db)
     Create a new author with proper validation and error handling.
     """
     try:
-        result = await db.execute(select(Author).where(Author.name == author.name))
-        if result.scalar_one_or_none():
-            raise ConflictError("Author", f"Author with name '{author.name}' already exists")
+        # Single round-trip insert; the unique index on name detects duplicates
+        result = await db.execute(
+            dialect_insert(db, Author)
+            .values(name=author.name)
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Author.id, Author.name)
+        )
+        db_author = result.first()
+        if db_author is None:
+            raise ConflictError(f"Author with name '{author.name}' already exists")
         
-        db_author = Author(name=author.name)
-        db.add(db_author)
         await db.commit()
-        await db.refresh(db_author)
         
         logger.info(f"Author created: {db_author.id} - {db_author.name}")
         return db_author
@@ -534,6 +538,9 @@ async def search_books(query: str, limit: int = 5, db: AsyncSession = Depends(ge
                 }
                 for book in books
             ]
+        else:
+            # Convert internal BookHit tuples to dicts at the API boundary
+            results = [hit._asdict() for hit in results]
         
         logger.info(f"Search completed: '{query}' returned {len(results)} results")
         return {"query": query, "results": results}
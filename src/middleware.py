@@ -21,7 +21,9 @@ class RequestTrackingMiddleware(BaseHTTPMiddleware):
         request_id = str(uuid.uuid4())
         start_time = time.time()
         
-        # Add request ID to request state
+        # Add request ID to the ASGI scope (cheap dict lookup for handlers)
+        # and to request state for backward compatibility
+        request.scope["request_id"] = request_id
         request.state.request_id = request_id
         
         try:
@@ -45,7 +47,7 @@ class RequestTrackingMiddleware(BaseHTTPMiddleware):
 async def error_handler(request: Request, exc: Exception) -> JSONResponse:
     """Global error handler for production with proper exception handling"""
     
-    request_id = getattr(request.state, "request_id", "unknown")
+    request_id = request.scope.get("request_id", "unknown")
     
     # Handle custom API exceptions
     from app.exceptions import BaseAPIException
@@ -199,6 +201,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self._client_requests: Dict[str, deque] = defaultdict(lambda: deque())
         self._cleanup_interval = 300  # Clean up old entries every 5 minutes
         self._last_cleanup = time.time()
+        # Constant header values, formatted once per configuration
+        self._limit_str = str(self.requests_per_minute)
+        self._window_str = str(self.window_seconds)
     
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP address from request"""
@@ -274,9 +279,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "retry_after": self.window_seconds
                 },
                 headers={
-                    "Retry-After": str(self.window_seconds),
-                    "X-RateLimit-Limit": str(self.requests_per_minute),
-                    "X-RateLimit-Remaining": str(max(0, self.requests_per_minute - len(client_queue))),
+                    "Retry-After": self._window_str,
+                    "X-RateLimit-Limit": self._limit_str,
+                    "X-RateLimit-Remaining": "0",
                     "X-RateLimit-Reset": str(int(current_time + self.window_seconds))
                 }
             )
@@ -289,8 +294,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         
         # Add rate limit headers to response
         remaining = max(0, self.requests_per_minute - len(client_queue))
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(current_time + self.window_seconds))
+        headers = response.headers
+        headers["X-RateLimit-Limit"] = self._limit_str
+        headers["X-RateLimit-Remaining"] = str(remaining)
+        headers["X-RateLimit-Reset"] = str(int(current_time + self.window_seconds))
         
         return response
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Float, Boolean, DateTime, Table, LargeBinary
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Float, Boolean, DateTime, Table, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
@@ -106,6 +106,10 @@ class Document(Base):
 
 class IngestionJob(Base):
     __tablename__ = "ingestion_jobs"
+    __table_args__ = (
+        # Serves the "completed today" counts (dashboard stats, check_test_stats)
+        Index("ix_jobs_status_createdat", "status", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     document_id = Column(Integer, ForeignKey("documents.id"))
@@ -1,20 +1,62 @@
 import json
+import hashlib
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Any
+from cachetools import LRUCache
+from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models import Book, Review
+from app.schemas import BookHit
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
 
 class RAGPipeline:
-    def __init__(self):
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.embeddings_store = {}  # In-memory store: {book_id: {"embedding": [...], "metadata": {...}, "content": "..."}}
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME):
+        self.model_name = model_name
+        self._embedding_model = None  # loaded on first use, see embedding_model
+        # Content-hash keyed cache of embeddings; the model name is part of the key
+        # so swapping models never serves stale vectors
+        self._embedding_cache = LRUCache(maxsize=1024)
+        self._embedding_cache_lock = threading.Lock()
+        self.embeddings_store = {}  # In-memory store: {book_id: {"embedding": ndarray, "metadata": {...}, "content": "..."}}
+        # Stacked embeddings for vectorized search, rebuilt lazily after indexing
+        self._emb_matrix = None
+        self._ids = []
+    
+    @property
+    def embedding_model(self):
+        """Load the sentence-transformer on first use so importing this module stays cheap"""
+        if self._embedding_model is None:
+            from sentence_transformers import SentenceTransformer
+            self._embedding_model = SentenceTransformer(self.model_name)
+        return self._embedding_model
     
-    def generate_embeddings(self, text: str) -> List[float]:
-        """Generate embeddings for given text"""
-        return self.embedding_model.encode(text).tolist()
+    def generate_embeddings(self, text: str) -> np.ndarray:
+        """Generate a normalized 1-D float32 embedding for given text (cached by content)"""
+        cache_key = (self.model_name, hashlib.sha256(text.encode()).digest())
+        with self._embedding_cache_lock:
+            embedding = self._embedding_cache.get(cache_key)
+        if embedding is not None:
+            return embedding
+        
+        embedding = self.embedding_model.encode(
+            text, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32, copy=False)
+        # Cached arrays are shared between callers, so make them read-only
+        embedding.flags.writeable = False
+        with self._embedding_cache_lock:
+            self._embedding_cache[cache_key] = embedding
+        return embedding
+    
+    def _get_emb_matrix(self) -> np.ndarray:
+        """Return the (N, dim) embedding matrix, rebuilding it if the store changed"""
+        if self._emb_matrix is None:
+            self._ids = list(self.embeddings_store.keys())
+            self._emb_matrix = np.vstack(
+                [self.embeddings_store[book_id]["embedding"] for book_id in self._ids]
+            )
+        return self._emb_matrix
     
     async def index_book(self, db: AsyncSession, book_id: int):
         """Index a book's content for RAG retrieval"""
@@ -58,31 +100,33 @@ class RAGPipeline:
                 },
                 "content": content
             }
+            self._emb_matrix = None
         except Exception as e:
             pass
     
-    def search_similar_books(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
+    def search_similar_books(self, query: str, n_results: int = 5) -> List[BookHit]:
         """Search for similar books using RAG"""
         if not self.embeddings_store:
             return []
         
-        query_embedding = np.array(self.generate_embeddings(query)).reshape(1, -1)
+        # Embeddings are normalized, so cosine similarity is a plain dot product
+        query_embedding = self.generate_embeddings(query)
+        scores = self._get_emb_matrix() @ query_embedding
         
-        results = []
-        for book_id, data in self.embeddings_store.items():
-            book_embedding = np.array(data["embedding"]).reshape(1, -1)
-            similarity = cosine_similarity(query_embedding, book_embedding)[0][0]
-            
-            results.append({
-                "book_id": book_id,
-                "similarity_score": float(similarity),
-                "metadata": data["metadata"],
-                "content": data["content"]
-            })
+        k = min(n_results, scores.size)
+        if k <= 0:
+            return []
         
-        # Sort by similarity score and return top results
-        results.sort(key=lambda x: x["similarity_score"], reverse=True)
-        return results[:n_results]
+        # Select the top-k indices in O(N), then order only those k
+        top_idx = np.argpartition(-scores, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+        
+        results = []
+        for i in top_idx:
+            book_id = self._ids[i]
+            data = self.embeddings_store[book_id]
+            results.append(BookHit(book_id, float(scores[i]), data["metadata"], data["content"]))
+        return results
 
 # Global instance
 rag_pipeline = RAGPipeline()
\ No newline at end of file
@@ -1,7 +1,8 @@
-from typing import List, Dict, Any
+from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models import Book, Review
+from app.schemas import BookHit
 
 class MinimalRAGPipeline:
     def __init__(self):
@@ -63,7 +64,7 @@ class MinimalRAGPipeline:
         except Exception:
             pass
     
-    def search_similar_books(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
+    def search_similar_books(self, query: str, n_results: int = 5) -> List[BookHit]:
         """Simple text matching search"""
         if not self.embeddings_store:
             return []
@@ -81,14 +82,14 @@ class MinimalRAGPipeline:
                     score += 1.0
             
             if score > 0:
-                results.append({
-                    "book_id": book_id,
-                    "similarity_score": score / len(query_lower.split()),
-                    "metadata": data["metadata"],
-                    "content": data["content"]
-                })
+                results.append(BookHit(
+                    book_id,
+                    score / len(query_lower.split()),
+                    data["metadata"],
+                    data["content"]
+                ))
         
-        results.sort(key=lambda x: x["similarity_score"], reverse=True)
+        results.sort(key=lambda x: x.similarity_score, reverse=True)
         return results[:n_results]
 
 # Global instance
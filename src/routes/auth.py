@@ -1,17 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from app.database import get_db
-from app.models import User, Role
-from app.security import hash_password, verify_password, create_access_token
+from sqlalchemy import exists, insert
+from sqlalchemy.orm import joinedload
+from app.database import get_db, dialect_insert
+from app.models import User, Role, user_roles
+from app.security import pwd_context, hash_password, rehash_password, verify_password, password_needs_rehash, create_access_token
 from app.config import settings
 from app.logging_config import get_logger
 from pydantic import BaseModel, Field, validator
 from typing import Optional
+import secrets
 
 logger = get_logger(__name__)
 
+# Real hash of a random password, so the no-user branch of login costs the
+# same as a genuine verification (a malformed dummy hash fails fast)
+_DUMMY_HASH = pwd_context.hash(secrets.token_urlsafe(16))
+
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 class SignupRequest(BaseModel):
@@ -37,6 +43,36 @@ class LoginRequest(BaseModel):
     username: str = Field(..., min_length=1, max_length=50)
     password: str = Field(..., min_length=1)
 
+async def _get_or_create_role_id(db: AsyncSession, name: str, **permissions) -> int:
+    """
+    Idempotent role insert that takes no row lock when the role already exists.
+    Only the id is returned, so the role's users collection is never loaded.
+    DO NOTHING returns no row on conflict, so fall back to a SELECT of the id.
+    """
+    stmt = (
+        dialect_insert(db, Role)
+        .values(name=name, **permissions)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Role.id)
+    )
+    result = await db.execute(stmt)
+    role_id = result.scalar_one_or_none()
+    if role_id is None:
+        result = await db.execute(select(Role.id).where(Role.name == name))
+        role_id = result.scalar_one()
+    return role_id
+
+async def _add_user_with_role(db: AsyncSession, username: str, password_hash: str, role_id: int) -> User:
+    """
+    Insert a user and link it to a role by id through the association table,
+    so no Role object (and none of its users) is attached to the session.
+    """
+    user = User(username=username, password_hash=password_hash, is_active=True)
+    db.add(user)
+    await db.flush()
+    await db.execute(insert(user_roles).values(user_id=user.id, role_id=role_id))
+    return user
+
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
 async def signup(data: SignupRequest, db: AsyncSession = Depends(get_db)):
     """
@@ -44,48 +80,35 @@ async def signup(data: SignupRequest, db: AsyncSession = Depends(get_db)):
     Production-grade with proper validation and error handling.
     """
     try:
-        # Check if user exists
-        result = await db.execute(select(User).where(User.username == data.username))
-        if result.scalar_one_or_none():
+        # Check if user exists (boolean EXISTS, no row hydration)
+        result = await db.execute(select(exists().where(User.username == data.username)))
+        if result.scalar():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already exists"
             )
         
-        # Get or create default user role
-        user_role_result = await db.execute(select(Role).where(Role.name == "user"))
-        user_role = user_role_result.scalar_one_or_none()
-        
-        if not user_role:
-            user_role = Role(
-                name="user",
-                can_read=True,
-                can_write=False,
-                can_delete=False,
-                is_admin=False
-            )
-            db.add(user_role)
-            await db.flush()
-        
-        # Create user with hashed password
+        # Hash before touching the roles table so the slow hash runs outside
+        # the transaction's write locks
         try:
-            password_hash = hash_password(data.password)
+            password_hash = await hash_password(data.password)
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e)
             )
         
-        user = User(
-            username=data.username,
-            password_hash=password_hash,
-            is_active=True
+        # Get or create default user role
+        user_role_id = await _get_or_create_role_id(
+            db,
+            "user",
+            can_read=True,
+            can_write=False,
+            can_delete=False,
+            is_admin=False
         )
-        db.add(user)
-        await db.flush()
         
-        # Assign default user role
-        user.roles = [user_role]
+        await _add_user_with_role(db, data.username, password_hash, user_role_id)
         await db.commit()
         
         logger.info(f"New user registered: {data.username}")
@@ -128,48 +151,35 @@ async def create_admin(
         # For now, we'll allow it but log it - you should add proper auth
     
     try:
-        # Check if user exists
-        result = await db.execute(select(User).where(User.username == data.username))
-        if result.scalar_one_or_none():
+        # Check if user exists (boolean EXISTS, no row hydration)
+        result = await db.execute(select(exists().where(User.username == data.username)))
+        if result.scalar():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already exists"
             )
         
-        # Check if admin role exists, create if not
-        admin_role_result = await db.execute(select(Role).where(Role.name == "admin"))
-        admin_role = admin_role_result.scalar_one_or_none()
-        
-        if not admin_role:
-            admin_role = Role(
-                name="admin",
-                can_read=True,
-                can_write=True,
-                can_delete=True,
-                is_admin=True
-            )
-            db.add(admin_role)
-            await db.flush()
-        
-        # Create admin user
+        # Hash before touching the roles table so the slow hash runs outside
+        # the transaction's write locks
         try:
-            password_hash = hash_password(data.password)
+            password_hash = await hash_password(data.password)
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e)
             )
         
-        user = User(
-            username=data.username,
-            password_hash=password_hash,
-            is_active=True
+        # Get or create admin role
+        admin_role_id = await _get_or_create_role_id(
+            db,
+            "admin",
+            can_read=True,
+            can_write=True,
+            can_delete=True,
+            is_admin=True
         )
-        db.add(user)
-        await db.flush()
         
-        # Assign admin role
-        user.roles = [admin_role]
+        await _add_user_with_role(db, data.username, password_hash, admin_role_id)
         await db.commit()
         
         logger.warning(f"Admin user created: {data.username}")  # Log as warning for audit
@@ -200,34 +210,41 @@ async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
     Production-grade with proper security measures.
     """
     try:
+        # Single round-trip: user and roles come back in one JOINed statement
         result = await db.execute(
-            select(User).options(selectinload(User.roles)).where(User.username == data.username)
+            select(User).options(joinedload(User.roles)).where(User.username == data.username)
         )
-        user = result.scalar_one_or_none()
+        user = result.unique().scalar_one_or_none()
 
         # Use constant-time comparison to prevent timing attacks
         if not user:
             # Still verify password against dummy hash to prevent user enumeration
-            verify_password(data.password, "$2b$12$dummy.hash.to.prevent.timing.attacks")
+            await verify_password(data.password, _DUMMY_HASH, use_cache=False)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
         
         if not user.is_active:
+            await verify_password(data.password, _DUMMY_HASH, use_cache=False)
             logger.warning(f"Inactive user attempted login: {data.username}")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User account is inactive"
             )
 
-        if not verify_password(data.password, user.password_hash):
+        if not await verify_password(data.password, user.password_hash):
             logger.warning(f"Failed login attempt for user: {data.username}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
 
+        # Transparently upgrade legacy bcrypt hashes to Argon2id
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = await rehash_password(data.password)
+            await db.commit()
+
         # Get user roles
         role_names = [role.name for role in user.roles] if user.roles else []
 
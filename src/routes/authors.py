@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.database import get_db
+from app.database import get_db, dialect_insert
 from app.models import Author
 from app.schemas import AuthorCreate, AuthorResponse
 from typing import List
@@ -11,14 +11,18 @@ router = APIRouter(prefix="/authors", tags=["Authors"])
 @router.post("/", response_model=AuthorResponse)
 async def create_author(author: AuthorCreate, db: AsyncSession = Depends(get_db)):
     try:
-        result = await db.execute(select(Author).where(Author.name == author.name))
-        if result.scalar_one_or_none():
+        # Single round-trip insert; the unique index on name detects duplicates
+        result = await db.execute(
+            dialect_insert(db, Author)
+            .values(name=author.name)
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Author.id, Author.name)
+        )
+        db_author = result.first()
+        if db_author is None:
             raise HTTPException(status_code=400, detail="Author already exists")
         
-        db_author = Author(name=author.name)
-        db.add(db_author)
         await db.commit()
-        await db.refresh(db_author)
         return db_author
     except HTTPException:
         raise
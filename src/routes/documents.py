@@ -17,11 +17,8 @@ async def upload_document(
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        # Read file content for S3 upload if needed
-        file_content = await file.read()
-        
-        # Upload based on environment (S3 in production, local in development)
-        file_path = await s3_service.upload_file(file_content, file.filename)
+        # Stream upload based on environment (S3 in production, local in development)
+        file_size, file_path = await s3_service.upload_stream(file, file.filename)
         
         if not file_path:
             raise HTTPException(status_code=500, detail="Failed to upload file")
@@ -29,7 +26,7 @@ async def upload_document(
         # Save document record with file size
         doc = Document(
             filename=file.filename,
-            file_size=len(file_content)
+            file_size=file_size
         )
         db.add(doc)
         await db.commit()
@@ -39,7 +36,7 @@ async def upload_document(
             "message": "Document uploaded successfully",
             "document_id": doc.id,
             "filename": file.filename,
-            "file_size": len(file_content)
+            "file_size": file_size
         }
         
         # Add S3 info only in production
@@ -54,20 +51,29 @@ async def upload_document(
 
 @router.get("/")
 async def list_documents(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Document))
-    documents = result.scalars().all()
+    # Select only the listed columns as plain rows - no ORM hydration
+    result = await db.execute(
+        select(
+            Document.id,
+            Document.filename,
+            Document.uploaded_at,
+            Document.status,
+            Document.file_size,
+            Document.uploaded_by
+        )
+    )
     
     return [
         {
-            "id": doc.id,
-            "filename": doc.filename,
-            "uploaded_at": doc.uploaded_at.isoformat() if doc.uploaded_at else None,
-            "status": doc.status,
-            "file_size": doc.file_size or 0,
-            "uploaded_by": doc.uploaded_by,
-            "download_url": f"/documents/{doc.id}/download"
+            "id": doc_id,
+            "filename": filename,
+            "uploaded_at": uploaded_at,
+            "status": doc_status,
+            "file_size": file_size or 0,
+            "uploaded_by": uploaded_by,
+            "download_url": f"/documents/{doc_id}/download"
         }
-        for doc in documents
+        for doc_id, filename, uploaded_at, doc_status, file_size, uploaded_by in result.all()
     ]
 
 @router.get("/{document_id}/download")
@@ -85,7 +91,7 @@ async def download_document(document_id: int, db: AsyncSession = Depends(get_db)
         file_like = io.BytesIO(content.encode())
         
         return StreamingResponse(
-            io.BytesIO(content.encode()),
+            file_like,
             media_type="text/plain",
             headers={"Content-Disposition": f"attachment; filename={document.filename}"}
         )
@@ -39,7 +39,7 @@ async def create_user(user_data: CreateUserRequest, db: AsyncSession = Depends(g
         # Create user using ORM
         user = User(
             username=user_data.username,
-            password_hash=hash_password(user_data.password)
+            password_hash=await hash_password(user_data.password)
         )
         db.add(user)
         await db.flush()  # Get user ID without committing
@@ -1,9 +1,17 @@
 from app.config import settings
-from typing import Optional
+from typing import Optional, Tuple
+from cachetools import TTLCache
+import asyncio
 
 class S3Service:
+    # Multipart parts must be at least 5 MiB (except the last one)
+    UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+    # Presigned URL lifetime; cached URLs are dropped a minute before they expire
+    PRESIGN_EXPIRY = 3600
+
     def __init__(self):
         self.enabled = settings.USE_S3
+        self._url_cache = TTLCache(maxsize=4096, ttl=self.PRESIGN_EXPIRY - 60)
         if self.enabled:
             try:
                 import boto3
@@ -30,10 +38,10 @@ class S3Service:
         
         try:
             # Production - upload to S3
-            file_extension = filename.split('.')[-1] if '.' in filename else ''
-            s3_key = f"documents/{self.uuid.uuid4()}.{file_extension}" if file_extension else f"documents/{self.uuid.uuid4()}"
+            s3_key = self._generate_key(filename)
             
-            self.s3_client.put_object(
+            await asyncio.to_thread(
+                self.s3_client.put_object,
                 Bucket=self.bucket_name,
                 Key=s3_key,
                 Body=file_content,
@@ -45,6 +53,81 @@ class S3Service:
             print(f"Error uploading to S3: {e}")
             return None
 
+    async def upload_stream(self, file, filename: str) -> Tuple[int, Optional[str]]:
+        """
+        Stream an UploadFile to S3 with a multipart upload, one chunk at a time,
+        so the whole file is never buffered in memory.
+        Files smaller than one chunk go through a single put_object instead.
+        Returns (file_size, key); key is None if the upload failed.
+        """
+        chunk = await file.read(self.UPLOAD_CHUNK_SIZE)
+        if len(chunk) < self.UPLOAD_CHUNK_SIZE:
+            return len(chunk), await self.upload_file(chunk, filename)
+        
+        file_size = 0
+        if not self.enabled:
+            # Local development - just measure the file and return filename
+            while chunk:
+                file_size += len(chunk)
+                chunk = await file.read(self.UPLOAD_CHUNK_SIZE)
+            return file_size, filename
+        
+        s3_key = self._generate_key(filename)
+        upload_id = None
+        try:
+            upload = await asyncio.to_thread(
+                self.s3_client.create_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                ContentType=self._get_content_type(filename)
+            )
+            upload_id = upload["UploadId"]
+            
+            parts = []
+            part_number = 1
+            while True:
+                file_size += len(chunk)
+                part = await asyncio.to_thread(
+                    self.s3_client.upload_part,
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    PartNumber=part_number,
+                    UploadId=upload_id,
+                    Body=chunk
+                )
+                parts.append({"PartNumber": part_number, "ETag": part["ETag"]})
+                part_number += 1
+                chunk = await file.read(self.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+            
+            await asyncio.to_thread(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+            return file_size, s3_key
+        except Exception as e:
+            print(f"Error uploading to S3: {e}")
+            if upload_id:
+                try:
+                    await asyncio.to_thread(
+                        self.s3_client.abort_multipart_upload,
+                        Bucket=self.bucket_name,
+                        Key=s3_key,
+                        UploadId=upload_id
+                    )
+                except Exception:
+                    pass
+            return file_size, None
+
+    def _generate_key(self, filename: str) -> str:
+        """Generate a unique S3 key that keeps the original file extension"""
+        file_extension = filename.split('.')[-1] if '.' in filename else ''
+        return f"documents/{self.uuid.uuid4()}.{file_extension}" if file_extension else f"documents/{self.uuid.uuid4()}"
+
     def _get_content_type(self, filename: str) -> str:
         """Get content type based on file extension"""
         extension = filename.split('.')[-1].lower() if '.' in filename else ''
@@ -64,12 +147,17 @@ class S3Service:
         if not self.enabled:
             return f"/local/files/{s3_key}"
         
+        url = self._url_cache.get(s3_key)
+        if url:
+            return url
+        
         try:
             url = self.s3_client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': self.bucket_name, 'Key': s3_key},
-                ExpiresIn=3600
+                ExpiresIn=self.PRESIGN_EXPIRY
             )
+            self._url_cache[s3_key] = url
             return url
         except Exception:
             return ""
@@ -1,19 +1,46 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, List, NamedTuple
+from datetime import datetime, timezone
+from functools import lru_cache
+import time
+
+
+@lru_cache(maxsize=1)
+def _max_year(day: int) -> int:
+    """Upper bound for year_published, recomputed once per day (keyed on epoch day)"""
+    return datetime.now(timezone.utc).year + 10
+
+
+def _reject_blank(v, message: str):
+    """
+    Shared body of the mode='before' blank checks. They run ahead of
+    str_strip_whitespace and min_length, so whitespace-only input gets the
+    field's own message instead of pydantic's string_too_short.
+    """
+    if isinstance(v, str) and not v.strip():
+        raise ValueError(message)
+    return v
 
 
 class BookBase(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     title: str = Field(..., min_length=1, max_length=500, description="Book title")
     author_id: int = Field(..., gt=0, description="Author ID")
     genre_id: int = Field(..., gt=0, description="Genre ID")
-    year_published: Optional[int] = Field(None, ge=1000, le=datetime.now().year + 10, description="Year published")
+    year_published: Optional[int] = Field(None, ge=1000, description="Year published")
 
-    @validator('title')
+    @field_validator('title', mode='before')
+    @classmethod
     def validate_title(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Title cannot be empty')
-        return v.strip()
+        return _reject_blank(v, 'Title cannot be empty')
+
+    @field_validator('year_published')
+    @classmethod
+    def validate_year_published(cls, v):
+        if v is not None and v > _max_year(int(time.time() // 86400)):
+            raise ValueError('Year published is too far in the future')
+        return v
 
 class BookCreate(BookBase):
     summary: Optional[str] = Field(None, max_length=10000, description="Book summary")
@@ -35,40 +62,49 @@ class BookResponse(BaseModel):
     author_name: Optional[str] = None
     genre_name: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AuthorCreate(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     name: str = Field(..., min_length=1, max_length=200, description="Author name")
     
-    @validator('name')
+    @field_validator('name', mode='before')
+    @classmethod
     def validate_name(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Author name cannot be empty')
-        return v.strip().title()  # Capitalize properly
+        return _reject_blank(v, 'Author name cannot be empty')
+
+    @field_validator('name')
+    @classmethod
+    def title_case_name(cls, v):
+        return v.title()  # Capitalize properly
 
 class AuthorResponse(BaseModel):
     id: int
     name: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class GenreCreate(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     name: str = Field(..., min_length=1, max_length=100, description="Genre name")
     
-    @validator('name')
+    @field_validator('name', mode='before')
+    @classmethod
     def validate_name(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Genre name cannot be empty')
-        return v.strip().title()  # Capitalize properly
+        return _reject_blank(v, 'Genre name cannot be empty')
+
+    @field_validator('name')
+    @classmethod
+    def title_case_name(cls, v):
+        return v.title()  # Capitalize properly
 
 class GenreResponse(BaseModel):
     id: int
     name: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AuthorUpdate(BaseModel):
     name: Optional[str] = None
@@ -77,26 +113,33 @@ class GenreUpdate(BaseModel):
     name: Optional[str] = None
 
 class ReviewCreate(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     user_id: int = Field(..., gt=0, description="User ID")
     review_text: str = Field(..., min_length=1, max_length=5000, description="Review text")
     rating: float = Field(..., ge=0.0, le=5.0, description="Rating (0.0 to 5.0)")
     
-    @validator('review_text')
+    @field_validator('review_text', mode='before')
+    @classmethod
     def validate_review_text(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Review text cannot be empty')
-        return v.strip()
+        return _reject_blank(v, 'Review text cannot be empty')
 
 
 class ReviewResponse(ReviewCreate):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     book_id: int
 
-    class Config:
-        from_attributes = True
-
 class GenerateSummaryRequest(BaseModel):
     content: str
 
 class GenerateSummaryResponse(BaseModel):
-    summary: str
\ No newline at end of file
+    summary: str
+
+class BookHit(NamedTuple):
+    """Internal search hit; converted to a dict only at the API boundary"""
+    book_id: int
+    similarity_score: float
+    metadata: dict
+    content: str
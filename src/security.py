@@ -1,30 +1,90 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.config import settings
 from typing import Optional, Dict, Any
+from cachetools import TTLCache
+import asyncio
+import hashlib
+import hmac
 import secrets
+import threading
+import time
 
-# Production-grade password hashing using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Production-grade password hashing using Argon2id; legacy bcrypt hashes
+# still verify and are flagged by needs_update for rehash on next login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    default="argon2",
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=1
+)
 
 # Use settings for secret key and algorithm
 ALGORITHM = "HS256"
 
-def hash_password(password: str) -> str:
+# Short-lived cache of verified token payloads to skip repeated HMAC + JSON work.
+# Keyed by a digest of the token - never by the raw token itself.
+_JWT_CACHE_TTL = 30
+_jwt_cache = TTLCache(maxsize=10000, ttl=_JWT_CACHE_TTL)
+_jwt_cache_lock = threading.Lock()
+
+# Short-lived cache of successful password verifications to skip repeated bcrypt work.
+# Keyed by an HMAC of the password and hash - the plaintext is never stored.
+_pw_cache = TTLCache(maxsize=2048, ttl=60)
+_pw_cache_lock = threading.Lock()
+
+async def hash_password(password: str) -> str:
     """
-    Hash password using bcrypt for production security.
+    Hash password using Argon2id for production security.
     Never use SHA256 or MD5 for password hashing.
+    Runs in a worker thread so the event loop is not blocked.
     """
     if not password or len(password) < 8:
         raise ValueError("Password must be at least 8 characters long")
-    return pwd_context.hash(password)
+    # Encode once here; passlib accepts bytes and skips its own str->UTF-8 step
+    return await asyncio.to_thread(pwd_context.hash, password.encode("utf-8"))
+
+async def verify_password(plain_password: str, hashed_password: str, use_cache: bool = True) -> bool:
+    """
+    Verify password against hash (Argon2id or legacy bcrypt) in a worker thread.
+    Successful verifications are cached briefly; failures always pay the full
+    hashing cost. Pass use_cache=False for paths that must stay constant-time.
+    """
+    # Encode once and reuse the bytes for both the cache key and the verifier
+    secret = plain_password.encode("utf-8")
+    if not use_cache:
+        return await asyncio.to_thread(pwd_context.verify, secret, hashed_password)
+    
+    cache_key = hmac.new(
+        settings.SECRET_KEY.encode(),
+        secret + b"|" + hashed_password.encode(),
+        "sha256"
+    ).digest()
+    with _pw_cache_lock:
+        if cache_key in _pw_cache:
+            return True
+    
+    verified = await asyncio.to_thread(pwd_context.verify, secret, hashed_password)
+    if verified:
+        with _pw_cache_lock:
+            _pw_cache[cache_key] = True
+    return verified
+
+async def rehash_password(password: str) -> str:
+    """
+    Re-hash an already verified password with the current default scheme.
+    Skips the length policy in hash_password, which older passwords may predate.
+    """
+    return await asyncio.to_thread(pwd_context.hash, password.encode("utf-8"))
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def password_needs_rehash(hashed_password: str) -> bool:
     """
-    Verify password against hash using bcrypt.
+    Check whether a stored hash uses a deprecated scheme or outdated parameters.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context.needs_update(hashed_password)
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -32,14 +92,16 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     """
     to_encode = data.copy()
     
+    # Integer epoch seconds: one clock read, no datetime conversion in jwt.encode
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow(),
+        "iat": now,
         "type": "access"
     })
     
@@ -54,13 +116,30 @@ def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Decode and verify JWT token.
     Returns None if token is invalid.
+    Verified payloads are cached briefly, never past the token's own expiry.
+    Each caller gets its own copy of the payload.
     """
+    cache_key = hashlib.sha256(token.encode()).digest()[:16]
+    with _jwt_cache_lock:
+        cached = _jwt_cache.get(cache_key)
+    if cached is not None:
+        payload, valid_until = cached
+        if valid_until > time.time():
+            return dict(payload)
+    
     try:
         secret_key = settings.SECRET_KEY
         payload = jwt.decode(token, secret_key, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    valid_until = time.time() + _JWT_CACHE_TTL
+    exp = payload.get("exp")
+    if exp is not None:
+        valid_until = min(valid_until, exp)
+    with _jwt_cache_lock:
+        _jwt_cache[cache_key] = (dict(payload), valid_until)
+    return payload
 
 def generate_secure_token(length: int = 32) -> str:
     """
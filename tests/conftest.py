@@ -1,79 +1,150 @@
+import os
 import pytest
-import asyncio
-from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, MagicMock
+import pytest_asyncio
+from datetime import timedelta
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 from app.main import app
+from app.config import settings
 from app.database import get_db
-from app.models import User, Role, Book, Review
-from app.security import hash_password, create_access_token
+from app.models import Base, User, Author, Genre, Book
+from passlib.context import CryptContext
+from app import security
+from app.security import create_access_token
 
-# Mock database session
-class MockAsyncSession:
-    def __init__(self):
-        self.data = {}
-        self.id_counter = 1
-    
-    async def execute(self, query):
-        result = MagicMock()
-        result.scalar_one_or_none.return_value = None
-        result.scalars.return_value.all.return_value = []
-        return result
-    
-    def add(self, obj):
-        obj.id = self.id_counter
-        self.id_counter += 1
-    
-    async def commit(self):
-        pass
-    
-    async def flush(self):
-        pass
-    
-    async def refresh(self, obj):
-        pass
-    
-    async def delete(self, obj):
-        pass
+# For an in-memory SQLite run, set TEST_DATABASE_URL to
+#   sqlite+aiosqlite:///file::memory:?cache=shared&uri=true
+# (see README). ON CONFLICT inserts go through database.dialect_insert.
+# Dedicated test database; override with TEST_DATABASE_URL.
+# Under pytest-xdist each worker (gw0, gw1, ...) gets its own database.
+TEST_DATABASE_URL = os.getenv(
+    "TEST_DATABASE_URL",
+    f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}"
+    f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}_test"
+)
+_is_sqlite = make_url(TEST_DATABASE_URL).get_backend_name() == "sqlite"
+_xdist_worker = os.getenv("PYTEST_XDIST_WORKER")
+# In-memory SQLite is already private to each xdist worker process
+if _xdist_worker and not _is_sqlite:
+    _url = make_url(TEST_DATABASE_URL)
+    TEST_DATABASE_URL = _url.set(database=f"{_url.database}_{_xdist_worker}").render_as_string(hide_password=False)
+
+async def _ensure_database(url: str):
+    """Create the test database if it does not exist yet (one per xdist worker)"""
+    url = make_url(url)
+    admin_engine = create_async_engine(
+        url.set(database="postgres"), poolclass=NullPool, isolation_level="AUTOCOMMIT"
+    )
+    try:
+        async with admin_engine.connect() as conn:
+            exists = await conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": url.database}
+            )
+            if not exists:
+                await conn.execute(text(f'CREATE DATABASE "{url.database}"'))
+    finally:
+        await admin_engine.dispose()
+
+@pytest.fixture(autouse=True)
+def _fast_hash(monkeypatch):
+    # Swap Argon2id for passlib's plaintext scheme so user-creating tests skip
+    # the deliberately slow hash; hash/verify/needs_update keep working
+    monkeypatch.setattr(security, "pwd_context", CryptContext(schemes=["plaintext"]))
+
+@pytest.fixture(autouse=True)
+def _local_storage(monkeypatch):
+    # Keep uploads in-process even if the environment enables S3: with storage
+    # disabled, upload_stream only measures the incoming chunks in memory
+    from app.s3_service import s3_service
+    monkeypatch.setattr(s3_service, "enabled", False)
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def test_engine():
+    # Schema is created once per session; tests are isolated by rollback below
+    if _is_sqlite:
+        # StaticPool keeps the single in-memory connection alive for the session
+        engine = create_async_engine(
+            TEST_DATABASE_URL, poolclass=StaticPool, connect_args={"check_same_thread": False}
+        )
+
+        # pysqlite's own transaction handling breaks SAVEPOINTs; emit BEGIN ourselves
+        @event.listens_for(engine.sync_engine, "connect")
+        def _disable_pysqlite_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+    else:
+        await _ensure_database(TEST_DATABASE_URL)
+        engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
 
-@pytest.fixture
-def mock_db():
-    return MockAsyncSession()
+@pytest_asyncio.fixture(loop_scope="session")
+async def db_session(test_engine):
+    # Each test runs inside an outer transaction that is rolled back at teardown;
+    # commits inside the app only release a SAVEPOINT
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await trans.rollback()
 
-@pytest.fixture
-def client(mock_db):
+@pytest_asyncio.fixture(loop_scope="session")
+async def client(db_session):
     def override_get_db():
-        yield mock_db
+        yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
+    # Requests go straight through ASGI in-loop, no thread portal per call;
+    # per test only the lightweight AsyncClient is created. ASGITransport does
+    # not run the app lifespan, so test_engine alone owns the schema.
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def admin_token():
-    return create_access_token({"sub": "admin", "roles": ["admin"]})
+    # Signed once per session; the long expiry keeps it valid for the whole run
+    return create_access_token({"sub": "admin", "roles": ["admin"]}, expires_delta=timedelta(hours=8))
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def auth_headers(admin_token):
     return {"Authorization": f"Bearer {admin_token}"}
 
-@pytest.fixture
-def sample_book():
+@pytest_asyncio.fixture(loop_scope="session")
+async def sample_book(db_session):
+    # Persisted in the test transaction, so the app sees it and teardown rolls it back
     book = Book(
-        id=1,
         title="Test Book",
-        author="Test Author", 
-        genre="Fiction",
+        author=Author(name="Test Author"),
+        genre=Genre(name="Fiction"),
         year_published=2023,
         summary="A test book"
     )
+    db_session.add(book)
+    await db_session.flush()
     return book
 
-@pytest.fixture
-def admin_user():
+@pytest_asyncio.fixture(loop_scope="session")
+async def admin_user(db_session):
     user = User(
-        id=1,
         username="admin",
-        password_hash=hash_password("password")
+        password_hash=security.pwd_context.hash("password")
     )
-    return user
\ No newline at end of file
+    db_session.add(user)
+    await db_session.flush()
+    return user
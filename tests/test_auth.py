@@ -1,32 +1,36 @@
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from passlib.context import CryptContext
+from app import security
+from app.models import User
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestAuth:
-    def test_signup(self, client: TestClient):
-        response = client.post("/auth/signup", json={
+    async def test_signup(self, client: AsyncClient):
+        response = await client.post("/auth/signup", json={
             "username": "testuser",
             "password": "testpass"
         })
         assert response.status_code == 200
         assert response.json()["message"] == "User registered successfully"
 
-    def test_create_admin(self, client: TestClient):
-        response = client.post("/auth/create-admin", json={
+    async def test_create_admin(self, client: AsyncClient):
+        response = await client.post("/auth/create-admin", json={
             "username": "admin",
             "password": "admin123"
         })
         assert response.status_code == 200
         assert response.json()["message"] == "Admin user created successfully"
 
-    def test_login_success(self, client: TestClient):
+    async def test_login_success(self, client: AsyncClient):
         # First create user
-        client.post("/auth/signup", json={
+        await client.post("/auth/signup", json={
             "username": "testuser",
             "password": "testpass"
         })
         
         # Then login
-        response = client.post("/auth/login", json={
+        response = await client.post("/auth/login", json={
             "username": "testuser",
             "password": "testpass"
         })
@@ -34,15 +38,31 @@ class TestAuth:
         assert "access_token" in response.json()
         assert response.json()["token_type"] == "bearer"
 
-    def test_login_invalid_credentials(self, client: TestClient):
-        response = client.post("/auth/login", json={
+    async def test_login_upgrades_short_legacy_password(self, client: AsyncClient, db_session, monkeypatch):
+        # A deprecated scheme stands in for legacy bcrypt; the password predates the 8-character policy
+        monkeypatch.setattr(security, "pwd_context", CryptContext(
+            schemes=["hex_md5", "plaintext"], default="plaintext", deprecated=["hex_md5"]
+        ))
+        user = User(username="legacy", password_hash=security.pwd_context.hash("abc", scheme="hex_md5"))
+        db_session.add(user)
+        await db_session.flush()
+        
+        response = await client.post("/auth/login", json={
+            "username": "legacy",
+            "password": "abc"
+        })
+        assert response.status_code == 200
+        assert not security.password_needs_rehash(user.password_hash)
+
+    async def test_login_invalid_credentials(self, client: AsyncClient):
+        response = await client.post("/auth/login", json={
             "username": "nonexistent",
             "password": "wrongpass"
         })
         assert response.status_code == 401
         assert response.json()["detail"] == "Invalid credentials"
 
-    def test_logout(self, client: TestClient):
-        response = client.post("/auth/logout")
+    async def test_logout(self, client: AsyncClient):
+        response = await client.post("/auth/logout")
         assert response.status_code == 200
         assert "Logout handled on client side" in response.json()["message"]
\ No newline at end of file
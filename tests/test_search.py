@@ -1,43 +1,46 @@
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestSearch:
-    def test_search_post(self, client: TestClient, sample_book):
-        response = client.post("/search?query=Test&limit=5")
+    async def test_search_post(self, client: AsyncClient, sample_book):
+        response = await client.post("/search?query=Test&limit=5")
         assert response.status_code == 200
         assert "query" in response.json()
         assert "results" in response.json()
 
-    def test_search_get(self, client: TestClient, sample_book):
-        response = client.get("/search?query=Test&limit=5")
+    async def test_search_get(self, client: AsyncClient, sample_book):
+        response = await client.get("/search?query=Test&limit=5")
         assert response.status_code == 200
         assert response.json()["query"] == "Test"
         assert "results" in response.json()
 
-    def test_search_empty_query(self, client: TestClient):
-        response = client.get("/search?query=&limit=5")
+    async def test_search_empty_query(self, client: AsyncClient):
+        response = await client.get("/search?query=&limit=5")
         assert response.status_code == 200
         assert response.json()["query"] == ""
 
-    def test_reindex_all(self, client: TestClient, sample_book):
-        response = client.post("/reindex-all")
+    async def test_reindex_all(self, client: AsyncClient, sample_book):
+        response = await client.post("/reindex-all")
         assert response.status_code == 200
         assert "Reindexed" in response.json()["message"]
 
-    def test_debug_embeddings(self, client: TestClient):
-        response = client.get("/debug/embeddings")
+    async def test_debug_embeddings(self, client: AsyncClient):
+        response = await client.get("/debug/embeddings")
         assert response.status_code == 200
         assert "total_books_indexed" in response.json()
         assert "book_ids" in response.json()
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestRecommendations:
-    def test_recommendations(self, client: TestClient, sample_book):
-        response = client.get("/recommendations?genre=Fiction")
+    async def test_recommendations(self, client: AsyncClient, sample_book):
+        response = await client.get("/recommendations?genre=Fiction")
         assert response.status_code == 200
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestSummaryGeneration:
-    def test_generate_summary_from_content(self, client: TestClient):
-        response = client.post("/generate-summary", json={
+    async def test_generate_summary_from_content(self, client: AsyncClient):
+        response = await client.post("/generate-summary", json={
             "content": "This is a test book content for summary generation."
         })
         assert response.status_code == 200
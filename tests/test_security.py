@@ -0,0 +1,63 @@
+import time
+import pytest
+from datetime import timedelta
+from jose import JWTError
+from app import security
+from app.security import create_access_token, decode_access_token, verify_password
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    security._jwt_cache.clear()
+    security._pw_cache.clear()
+    yield
+    security._jwt_cache.clear()
+    security._pw_cache.clear()
+
+class TestTokenCache:
+    def test_cached_payload_not_served_past_exp(self, monkeypatch):
+        token = create_access_token({"sub": "alice"}, expires_delta=timedelta(seconds=5))
+        now = time.time()
+        assert decode_access_token(token)["sub"] == "alice"
+        
+        # Past exp the cache entry must be ignored, leaving the decision to jose
+        def expired(*args, **kwargs):
+            raise JWTError("Signature has expired.")
+        monkeypatch.setattr(security.time, "time", lambda: now + 10)
+        monkeypatch.setattr(security.jwt, "decode", expired)
+        assert decode_access_token(token) is None
+
+    def test_invalid_token_not_cached(self):
+        assert decode_access_token("not-a-jwt") is None
+        assert len(security._jwt_cache) == 0
+
+    def test_returns_copy_of_cached_payload(self):
+        token = create_access_token({"sub": "alice"})
+        first = decode_access_token(token)
+        first["sub"] = "mallory"
+        assert decode_access_token(token)["sub"] == "alice"
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestPasswordCache:
+    async def test_failed_verification_not_cached(self):
+        hashed = security.pwd_context.hash("password123")
+        assert await verify_password("wrongpass1", hashed) is False
+        assert len(security._pw_cache) == 0
+
+    async def test_successful_verification_cached(self):
+        hashed = security.pwd_context.hash("password123")
+        assert await verify_password("password123", hashed) is True
+        assert len(security._pw_cache) == 1
+
+    async def test_use_cache_false_bypasses_cache(self, monkeypatch):
+        hashed = security.pwd_context.hash("password123")
+        assert await verify_password("password123", hashed) is True
+        
+        # A cached success must not short-circuit the uncached path
+        calls = []
+        def verify(secret, hash_):
+            calls.append(secret)
+            return False
+        monkeypatch.setattr(security.pwd_context, "verify", verify)
+        assert await verify_password("password123", hashed, use_cache=False) is False
+        assert calls == [b"password123"]
+        assert len(security._pw_cache) == 1
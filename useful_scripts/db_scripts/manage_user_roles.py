@@ -2,12 +2,12 @@ import asyncio
 import asyncpg
 from app.config import settings
 
-async def assign_default_roles():
-    db_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
-    
+# Usernames echoed in the summary; the rest are only counted
+USERNAME_SAMPLE_SIZE = 10
+
+async def assign_default_roles(conn: asyncpg.Connection):
+    """Give the default 'user' role to every user without a role, on an existing connection"""
     try:
-        conn = await asyncpg.connect(db_url)
-        
         # Create default 'user' role if it doesn't exist
         await conn.execute("""
             INSERT INTO roles (name, can_read, can_write, can_delete, is_admin)
@@ -19,28 +19,39 @@ async def assign_default_roles():
         user_role = await conn.fetchrow("SELECT id FROM roles WHERE name = 'user'")
         user_role_id = user_role['id']
         
-        # Find users without any roles
+        # Find users without any roles (anti-join; served by the user_roles primary key)
         users_without_roles = await conn.fetch("""
             SELECT u.id, u.username 
             FROM users u 
-            LEFT JOIN user_roles ur ON u.id = ur.user_id 
-            WHERE ur.user_id IS NULL
+            WHERE NOT EXISTS (SELECT 1 FROM user_roles ur WHERE ur.user_id = u.id)
         """)
         
-        # Assign default role to users without roles
-        for user in users_without_roles:
-            await conn.execute("""
+        # Assign default role to users without roles in one batched round-trip,
+        # parsing the INSERT once as a prepared statement
+        if users_without_roles:
+            insert_stmt = await conn.prepare("""
                 INSERT INTO user_roles (user_id, role_id) 
                 VALUES ($1, $2)
-            """, user['id'], user_role_id)
-            print(f"Assigned 'user' role to: {user['username']}")
+            """)
+            await insert_stmt.executemany(
+                [(user['id'], user_role_id) for user in users_without_roles]
+            )
+            sample = ", ".join(user['username'] for user in users_without_roles[:USERNAME_SAMPLE_SIZE])
+            more = len(users_without_roles) - USERNAME_SAMPLE_SIZE
+            print(f"Assigned 'user' role to: {sample}" + (f" (+{more} more)" if more > 0 else ""))
         
         print(f"Assigned default roles to {len(users_without_roles)} users")
         
     except Exception as e:
         print(f"Error: {e}")
+
+async def main():
+    db_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    conn = await asyncpg.connect(db_url)
+    try:
+        await assign_default_roles(conn)
     finally:
         await conn.close()
 
 if __name__ == "__main__":
-    asyncio.run(assign_default_roles())
\ No newline at end of file
+    asyncio.run(main())
@@ -1,97 +1,104 @@
 import asyncio
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from app.database import get_db
-from app.models import Author, Genre, Book
+import asyncpg
+from app.config import settings
 
 async def migrate_to_foreign_keys():
-    async for db in get_db():
-        try:
+    db_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    conn = None
+    
+    try:
+        conn = await asyncpg.connect(db_url)
+        
+        # Run the whole migration as one transaction: a single commit, and
+        # nothing is left half-applied if a step fails
+        async with conn.transaction():
             # Create authors and genres tables
-            await db.execute(text("""
+            await conn.execute("""
                 CREATE TABLE IF NOT EXISTS authors (
                     id SERIAL PRIMARY KEY,
                     name VARCHAR UNIQUE NOT NULL
                 );
-            """))
+            """)
             
-            await db.execute(text("""
+            await conn.execute("""
                 CREATE TABLE IF NOT EXISTS genres (
                     id SERIAL PRIMARY KEY,
                     name VARCHAR UNIQUE NOT NULL
                 );
-            """))
+            """)
             
             # Migrate existing data
-            # Get unique authors
-            result = await db.execute(text("SELECT DISTINCT author FROM books WHERE author IS NOT NULL"))
-            authors = result.fetchall()
+            # Get unique, trimmed, non-empty authors and genres in a single scan of books;
+            # trimming and de-duplication happen server-side
+            rows = await conn.fetch("""
+                SELECT DISTINCT v.kind, v.name
+                FROM books
+                CROSS JOIN LATERAL (VALUES ('author', trim(author)), ('genre', trim(genre))) AS v(kind, name)
+                WHERE v.name <> ''
+            """)
             
-            for (author_name,) in authors:
-                if author_name and author_name.strip():
-                    await db.execute(
-                        text("INSERT INTO authors (name) VALUES (:name) ON CONFLICT (name) DO NOTHING"),
-                        {"name": author_name.strip()}
-                    )
-            
-            # Get unique genres
-            result = await db.execute(text("SELECT DISTINCT genre FROM books WHERE genre IS NOT NULL"))
-            genres = result.fetchall()
+            author_names = [r['name'] for r in rows if r['kind'] == 'author']
+            genre_names = [r['name'] for r in rows if r['kind'] == 'genre']
             
-            for (genre_name,) in genres:
-                if genre_name and genre_name.strip():
-                    await db.execute(
-                        text("INSERT INTO genres (name) VALUES (:name) ON CONFLICT (name) DO NOTHING"),
-                        {"name": genre_name.strip()}
-                    )
+            # One INSERT per table, expanding the whole name array server-side
+            await conn.execute(
+                "INSERT INTO authors (name) SELECT unnest($1::text[]) ON CONFLICT (name) DO NOTHING",
+                author_names
+            )
+            await conn.execute(
+                "INSERT INTO genres (name) SELECT unnest($1::text[]) ON CONFLICT (name) DO NOTHING",
+                genre_names
+            )
             
             # Add new columns to books table
-            await db.execute(text("ALTER TABLE books ADD COLUMN IF NOT EXISTS author_id INTEGER"))
-            await db.execute(text("ALTER TABLE books ADD COLUMN IF NOT EXISTS genre_id INTEGER"))
-            
-            # Update books with foreign keys
-            await db.execute(text("""
-                UPDATE books SET author_id = authors.id 
-                FROM authors 
-                WHERE books.author = authors.name AND books.author_id IS NULL
-            """))
+            await conn.execute("ALTER TABLE books ADD COLUMN IF NOT EXISTS author_id INTEGER")
+            await conn.execute("ALTER TABLE books ADD COLUMN IF NOT EXISTS genre_id INTEGER")
             
-            await db.execute(text("""
-                UPDATE books SET genre_id = genres.id 
-                FROM genres 
-                WHERE books.genre = genres.name AND books.genre_id IS NULL
-            """))
+            # Update books with both foreign keys in a single pass; LEFT JOINs keep
+            # rows where only one of author/genre matches, rows matching neither are skipped
+            await conn.execute("""
+                WITH matched AS (
+                    SELECT b.id, a.id AS author_id, g.id AS genre_id
+                    FROM books b
+                    LEFT JOIN authors a ON b.author = a.name
+                    LEFT JOIN genres g ON b.genre = g.name
+                    WHERE (b.author_id IS NULL OR b.genre_id IS NULL)
+                      AND (a.id IS NOT NULL OR g.id IS NOT NULL)
+                )
+                UPDATE books
+                SET author_id = COALESCE(books.author_id, matched.author_id),
+                    genre_id = COALESCE(books.genre_id, matched.genre_id)
+                FROM matched
+                WHERE books.id = matched.id
+            """)
             
-            # Add foreign key constraints (PostgreSQL doesn't support IF NOT EXISTS for constraints)
-            try:
-                await db.execute(text("""
-                    ALTER TABLE books 
-                    ADD CONSTRAINT fk_books_author 
-                    FOREIGN KEY (author_id) REFERENCES authors(id)
-                """))
-            except:
-                pass  # Constraint might already exist
-            
-            try:
-                await db.execute(text("""
-                    ALTER TABLE books 
-                    ADD CONSTRAINT fk_books_genre 
-                    FOREIGN KEY (genre_id) REFERENCES genres(id)
-                """))
-            except:
-                pass  # Constraint might already exist
+            # Add foreign key constraints (PostgreSQL doesn't support IF NOT EXISTS for constraints).
+            # Check pg_constraint first instead of relying on a failed ALTER.
+            constraints = [
+                ("fk_books_author", "FOREIGN KEY (author_id) REFERENCES authors(id)"),
+                ("fk_books_genre", "FOREIGN KEY (genre_id) REFERENCES genres(id)"),
+            ]
+            for constraint_name, constraint_def in constraints:
+                exists = await conn.fetchval(
+                    "SELECT 1 FROM pg_constraint WHERE conname = $1 AND conrelid = 'books'::regclass",
+                    constraint_name
+                )
+                if not exists:
+                    await conn.execute(
+                        f"ALTER TABLE books ADD CONSTRAINT {constraint_name} {constraint_def}"
+                    )
             
             # Make columns NOT NULL after data migration
-            await db.execute(text("ALTER TABLE books ALTER COLUMN author_id SET NOT NULL"))
-            await db.execute(text("ALTER TABLE books ALTER COLUMN genre_id SET NOT NULL"))
-            
-            await db.commit()
-            print("Migration completed successfully!")
-            
-        except Exception as e:
-            await db.rollback()
-            print(f"Migration failed: {e}")
-        break
+            await conn.execute("ALTER TABLE books ALTER COLUMN author_id SET NOT NULL")
+            await conn.execute("ALTER TABLE books ALTER COLUMN genre_id SET NOT NULL")
+        
+        print("Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"Migration failed: {e}")
+    finally:
+        if conn:
+            await conn.close()
 
 if __name__ == "__main__":
-    asyncio.run(migrate_to_foreign_keys())
\ No newline at end of file
+    asyncio.run(migrate_to_foreign_keys())
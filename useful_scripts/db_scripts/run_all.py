@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Run the role setup scripts back to back over a single database connection,
+so the TCP/TLS/auth handshake is paid once for the whole bootstrap.
+"""
+import asyncio
+import asyncpg
+from app.config import settings
+# Sibling imports: like the other db scripts, this file is run directly
+# (python useful_scripts/db_scripts/run_all.py), which puts its folder on sys.path
+from update_roles_table import update_roles_table
+from manage_user_roles import assign_default_roles
+
+async def run_all():
+    db_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    
+    async with asyncpg.create_pool(db_url, min_size=1, max_size=1) as pool:
+        async with pool.acquire() as conn:
+            # Permission columns first: the default role insert relies on them
+            await update_roles_table(conn)
+            await assign_default_roles(conn)
+
+if __name__ == "__main__":
+    asyncio.run(run_all())
@@ -6,47 +6,45 @@ import asyncio
 import asyncpg
 from app.config import settings
 
-async def update_roles_table():
-    """Add permission columns to roles table if they don't exist"""
-    
-    # Parse database URL to get connection parameters
-    db_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+async def update_roles_table(conn: asyncpg.Connection):
+    """Add permission columns to roles table if they don't exist, on an existing connection"""
     
     try:
-        conn = await asyncpg.connect(db_url)
-        
-        # Check if columns exist and add them if they don't
-        columns_to_add = [
-            ("can_read", "BOOLEAN DEFAULT TRUE"),
-            ("can_write", "BOOLEAN DEFAULT FALSE"), 
-            ("can_delete", "BOOLEAN DEFAULT FALSE"),
-            ("is_admin", "BOOLEAN DEFAULT FALSE")
-        ]
-        
-        for column_name, column_def in columns_to_add:
-            try:
-                # Try to add the column
-                await conn.execute(f"ALTER TABLE roles ADD COLUMN {column_name} {column_def}")
-                print(f"Added column: {column_name}")
-            except asyncpg.DuplicateColumnError:
-                print(f"Column {column_name} already exists")
-            except Exception as e:
-                print(f"Error adding column {column_name}: {e}")
+        # Add any missing permission columns in a single ALTER TABLE,
+        # taking the table lock and writing the catalog only once
+        await conn.execute("""
+            ALTER TABLE roles
+                ADD COLUMN IF NOT EXISTS can_read BOOLEAN DEFAULT TRUE,
+                ADD COLUMN IF NOT EXISTS can_write BOOLEAN DEFAULT FALSE,
+                ADD COLUMN IF NOT EXISTS can_delete BOOLEAN DEFAULT FALSE,
+                ADD COLUMN IF NOT EXISTS is_admin BOOLEAN DEFAULT FALSE
+        """)
+        print("Permission columns present: can_read, can_write, can_delete, is_admin")
         
-        # Update existing roles to have default permissions
+        # ADD COLUMN ... DEFAULT already fills existing rows, so this only touches
+        # rows with an explicit NULL and leaves non-NULL permissions untouched
         await conn.execute("""
             UPDATE roles 
-            SET can_read = TRUE, can_write = FALSE, can_delete = FALSE, is_admin = FALSE 
-            WHERE can_read IS NULL
+            SET can_read = COALESCE(can_read, TRUE),
+                can_write = COALESCE(can_write, FALSE),
+                can_delete = COALESCE(can_delete, FALSE),
+                is_admin = COALESCE(is_admin, FALSE)
+            WHERE can_read IS NULL OR can_write IS NULL OR can_delete IS NULL OR is_admin IS NULL
         """)
         
         print("Roles table updated successfully!")
         
     except Exception as e:
         print(f"Error updating roles table: {e}")
+
+async def main():
+    # Parse database URL to get connection parameters
+    db_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    conn = await asyncpg.connect(db_url)
+    try:
+        await update_roles_table(conn)
     finally:
-        if 'conn' in locals():
-            await conn.close()
+        await conn.close()
 
 if __name__ == "__main__":
-    asyncio.run(update_roles_table())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
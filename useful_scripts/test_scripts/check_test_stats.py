@@ -1,32 +1,39 @@
 import asyncio
 from app.database import AsyncSessionLocal
 from app.models import IngestionJob
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, literal_column
 from datetime import datetime
 
 async def get_stats():
     async with AsyncSessionLocal() as db:
-        # Get all jobs
-        result = await db.execute(select(IngestionJob))
-        all_jobs = result.scalars().all()
+        # Total jobs and per-status counts, aggregated in the database
+        result = await db.execute(
+            select(IngestionJob.status, func.count())
+            .group_by(IngestionJob.status)
+        )
+        status_counts = dict(result.all())
         
-        print(f"Total jobs: {len(all_jobs)}")
+        print(f"Total jobs: {sum(status_counts.values())}")
+        print(f"Job status counts: {status_counts}")
         
         today = datetime.now().date()
         print(f"Today's date: {today}")
         
-        # Check each job
-        today_completed = 0
-        for job in all_jobs:
-            job_date = job.created_at.date() if job.created_at else None
-            is_today = job_date == today if job_date else False
-            is_completed = job.status == "completed"
-            
-            print(f"Job {job.id}: {job.created_at} -> {job_date} -> Today: {is_today}, Status: {job.status}")
-            
-            if is_today and is_completed:
-                today_completed += 1
+        # Count today's completed jobs with a single indexed COUNT(*)
+        result = await db.execute(
+            select(func.count())
+            .select_from(IngestionJob)
+            .where(
+                and_(
+                    IngestionJob.status == "completed",
+                    # Bare-column range so the (status, created_at) index covers both predicates
+                    IngestionJob.created_at >= func.current_date(),
+                    IngestionJob.created_at < literal_column("current_date + interval '1 day'")
+                )
+            )
+        )
+        today_completed = result.scalar() or 0
         
         print(f"Today completed count: {today_completed}")
 
-asyncio.run(get_stats())
\ No newline at end of file
+asyncio.run(get_stats())
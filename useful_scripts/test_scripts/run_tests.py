@@ -9,10 +9,12 @@ import sys
 def run_tests():
     """Run all tests with pytest"""
     try:
-        # Run pytest with coverage
+        # Run pytest in parallel across all cores (pytest-xdist);
+        # each worker uses its own test database
         result = subprocess.run([
             sys.executable, "-m", "pytest", 
             "tests/", 
+            "-n", "auto",
             "-v", 
             "--tb=short",
             "--disable-warnings"